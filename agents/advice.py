@@ -1,5 +1,6 @@
 import json
-from llm import call_llm
+from llm import call_llm, call_llm_prefixed
+from utils import build_prompt_parts, jd_affinity
 
 ALLOWED_KEYS = {"summary", "strengths", "gaps", "next_actions"}
 
@@ -38,7 +39,7 @@ def _repair_json_with_llm(bad_json_text: str) -> dict:
         "- Only fix syntax (missing commas/quotes/brackets).\n\n"
         f"JSON:\n{bad_json_text}\n"
     )
-    fixed_raw = call_llm(prompt)
+    fixed_raw = call_llm(prompt, key="advice_repair")
     return _try_load_json(fixed_raw)
 
 def _force_json_only(text: str) -> dict:
@@ -49,7 +50,7 @@ def _force_json_only(text: str) -> dict:
         "Convert the following content into that JSON now:\n"
         f"{text}\n"
     )
-    raw = call_llm(prompt)
+    raw = call_llm(prompt, key="advice_repair")
     return _try_load_json(raw)
 
 
@@ -120,11 +121,9 @@ def generate_advice(jd_data: dict, cv_data: dict, match_data: dict) -> dict:
     with open("prompts/advice.txt", "r", encoding="utf-8") as f:
         prompt = f.read()
 
-    prompt = prompt.replace("{{JD_JSON}}", json.dumps(jd_data, ensure_ascii=False, indent=2))
-    prompt = prompt.replace("{{CV_JSON}}", json.dumps(cv_data, ensure_ascii=False, indent=2))
-    prompt = prompt.replace("{{MATCH_JSON}}", json.dumps(match_data, ensure_ascii=False, indent=2))
-
-    raw = call_llm(prompt)
+    # Shared JD block first, so the rewriter call that follows reuses its prefill
+    prefix, suffix = build_prompt_parts(prompt, jd_data, cv_data, match_data)
+    raw = call_llm_prefixed(prefix, suffix, affinity=jd_affinity(jd_data), key="advice")
 
     try:
         data = _try_load_json(raw)
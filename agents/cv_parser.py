@@ -1,6 +1,31 @@
+import json
+
 from llm import call_llm
+from dedup import run_deduped, same_words, replaced_phrase, DEFAULT_THRESHOLD
+from utils import normalize_cv_json
 
 def parse_cv(cv_text: str) -> str:
     with open("prompts/cv_parser.txt", "r", encoding="utf-8") as f:
         prompt = f.read().replace("{{CV}}", cv_text)
-    return call_llm(prompt)
+    return call_llm(prompt, key="parse_cv")
+
+def _reuse_parse(cv_text: str, matched_text: str, raw: str) -> str | None:
+    """
+    Reuse an earlier parse only if the CV differs from the one it came from in whitespace/punctuation,
+    or only in the candidate name; the reused parse then takes the name from the new CV.
+    """
+    if same_words(matched_text, cv_text):
+        return raw
+    try:
+        data = normalize_cv_json(raw)
+        name = replaced_phrase(matched_text, cv_text, str(data.get("candidate_name") or ""))
+    except (ValueError, AttributeError):
+        return None
+    if name is None:
+        return None
+    data["candidate_name"] = name
+    return json.dumps(data, ensure_ascii=False)
+
+def parse_cv_batch(cv_texts: list[str], threshold: float = DEFAULT_THRESHOLD) -> tuple[list[str], dict]:
+    """parse_cv over a batch; near-duplicate CVs reuse an earlier parse. Returns (raw outputs, stats)."""
+    return run_deduped(cv_texts, parse_cv, threshold, reuse=_reuse_parse)
@@ -0,0 +1,76 @@
+import json
+from llm import call_llm_prefixed
+from utils import build_prompt_parts, jd_affinity
+from agents.advice import generate_advice, _try_load_json, _finalise_advice
+from agents.rewriter import rewrite_cv, _finalise_rewrite
+
+# One constrained generation for both the advice and rewrite schemas.
+# Saves a second prefill of the JD/CV/match payload and a second generation;
+# each half still goes through its agent's own normalization and safety clamp.
+
+FUSED_ENV = "JOBFIT_FUSED"
+
+_STR_LIST = {"type": "array", "items": {"type": "string"}}
+
+FUSED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "advice": {
+            "type": "object",
+            "properties": {
+                "summary": {"type": "string"},
+                "strengths": _STR_LIST,
+                "gaps": _STR_LIST,
+                "next_actions": _STR_LIST,
+            },
+            "required": ["summary", "strengths", "gaps", "next_actions"],
+        },
+        "rewrite": {
+            "type": "object",
+            "properties": {
+                "headline": {"type": "string"},
+                "summary": {"type": "string"},
+                "project_bullets": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"project": {"type": "string"}, "bullets": _STR_LIST},
+                        "required": ["project", "bullets"],
+                    },
+                },
+                "skills": _STR_LIST,
+                "notes": _STR_LIST,
+            },
+            "required": ["headline", "summary", "project_bullets", "skills", "notes"],
+        },
+    },
+    "required": ["advice", "rewrite"],
+}
+
+
+def advise_and_rewrite(jd_data: dict, cv_data: dict, match_data: dict) -> tuple[dict, dict]:
+    """
+    Returns (advice_data, rewrite_data) with the same shapes as
+    generate_advice() and rewrite_cv(), from a single LLM call.
+    Falls back to the two separate agents if the fused output can't be parsed.
+    """
+    with open("prompts/fused.txt", "r", encoding="utf-8") as f:
+        prompt = f.read()
+
+    prefix, suffix = build_prompt_parts(prompt, jd_data, cv_data, match_data)
+    raw = call_llm_prefixed(
+        prefix, suffix, format=FUSED_SCHEMA, affinity=jd_affinity(jd_data), key="fused"
+    )
+
+    try:
+        data = _try_load_json(raw)
+    except (json.JSONDecodeError, ValueError):
+        data = None
+
+    if not isinstance(data, dict) or not isinstance(data.get("advice"), dict) or not isinstance(data.get("rewrite"), dict):
+        return (
+            generate_advice(jd_data, cv_data, match_data),
+            rewrite_cv(jd_data, cv_data, match_data),
+        )
+
+    return _finalise_advice(data["advice"]), _finalise_rewrite(data["rewrite"])
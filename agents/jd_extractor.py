@@ -1,6 +1,38 @@
 from llm import call_llm
+from dedup import run_deduped, same_words, DEFAULT_THRESHOLD
+from utils import normalize_jd_json, extract_skills_from_text
+
+# JD fields whose terms must read the same in a JD that reuses an earlier extraction
+SKILL_FIELDS = ("required_skills", "preferred_skills", "key_keywords", "red_flags")
 
 def extract_jd(jd_text: str) -> str:
     with open("prompts/jd_extractor.txt", "r", encoding="utf-8") as f:
         prompt = f.read().replace("{{JD}}", jd_text)
-    return call_llm(prompt)
\ No newline at end of file
+    return call_llm(prompt, key="extract_jd")
+
+def _reuse_extraction(jd_text: str, matched_text: str, raw: str) -> str | None:
+    """
+    Reuse an earlier extraction only if the JD differs from the one it came from in whitespace/punctuation
+    and its skill and keyword sections are unchanged: every extracted skill/keyword term is present in
+    both texts or in neither (punctuation-sensitive, e.g. C++ vs C), and the raw-text skill scan agrees.
+    """
+    if not same_words(matched_text, jd_text):
+        return None
+    try:
+        data = normalize_jd_json(raw)
+    except (ValueError, AttributeError):
+        return None
+
+    old, new = matched_text.lower(), jd_text.lower()
+    for field in SKILL_FIELDS:
+        for term in data.get(field) or []:
+            t = str(term).strip().lower()
+            if t and (t in old) != (t in new):
+                return None
+    if extract_skills_from_text(old) != extract_skills_from_text(new):
+        return None
+    return raw
+
+def extract_jd_batch(jd_texts: list[str], threshold: float = DEFAULT_THRESHOLD) -> tuple[list[str], dict]:
+    """extract_jd over a batch; near-duplicate JDs reuse an earlier extraction. Returns (raw outputs, stats)."""
+    return run_deduped(jd_texts, extract_jd, threshold, reuse=_reuse_extraction)
@@ -1,5 +1,19 @@
 import json
-from llm import call_llm
+from llm import call_llm_prefixed
+from utils import build_prompt_parts, jd_affinity
+
+# Phrases that clear the rewritten headline/summary (prevents invented experience)
+BANNED_PHRASES = [
+    "trading",
+    "high-performance",
+    "high performance",
+    "low-latency",
+    "low latency",
+    "performance tuning",
+    "ultra-low-latency",
+    "ultra low latency",
+    "real-time trading",
+]
 
 
 def _strip_fences(s: str) -> str:
@@ -42,12 +56,19 @@ def rewrite_cv(jd_data: dict, cv_data: dict, match_data: dict) -> dict:
     with open("prompts/rewriter.txt", "r", encoding="utf-8") as f:
         prompt = f.read()
 
-    prompt = prompt.replace("{{JD_JSON}}", json.dumps(jd_data, indent=2, ensure_ascii=False))
-    prompt = prompt.replace("{{CV_JSON}}", json.dumps(cv_data, indent=2, ensure_ascii=False))
-    prompt = prompt.replace("{{MATCH_JSON}}", json.dumps(match_data, indent=2, ensure_ascii=False))
+    # Shared JD block first, so it reuses the advice call's prefill on the same host
+    prefix, suffix = build_prompt_parts(prompt, jd_data, cv_data, match_data)
+    raw = call_llm_prefixed(prefix, suffix, affinity=jd_affinity(jd_data), key="rewrite")
+    return _finalise_rewrite(_try_load_json(raw))
 
-    raw = call_llm(prompt)
-    data = _try_load_json(raw)
+
+def _finalise_rewrite(data: dict) -> dict:
+    """
+    Ensure stable schema and apply the safety clamp.
+    Shared with the fused advice + rewrite agent.
+    """
+    if not isinstance(data, dict):
+        data = {}
 
     out = {
         "headline": str(data.get("headline", "")).strip(),
@@ -66,18 +87,6 @@ def rewrite_cv(jd_data: dict, cv_data: dict, match_data: dict) -> dict:
 
 
     # SAFETY CLAMP (prevents invented experience)
-    
-    BANNED_PHRASES = [
-        "trading",
-        "high-performance",
-        "high performance",
-        "low-latency",
-        "low latency",
-        "performance tuning",
-        "ultra-low-latency",
-        "ultra low latency",
-        "real-time trading",
-    ]
 
     headline_l = out["headline"].lower()
     summary_l = out["summary"].lower()
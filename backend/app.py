@@ -1,7 +1,8 @@
 import sys
 import os
 import json
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+import asyncio
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
@@ -13,7 +14,15 @@ from agents.cv_parser import parse_cv
 from agents.matcher import match
 from agents.advice import generate_advice
 from agents.rewriter import rewrite_cv
+from agents.fused import advise_and_rewrite, FUSED_ENV
 from utils import normalize_jd_json, normalize_cv_json, extract_skills_from_text
+from profiling import maybe_profiled, env_enabled, flag_enabled
+from llm import POOL
+from deadlines import Deadline, Cancelled, DeadlineExceeded, scope
+
+# Whole-request budget in seconds (override per request with "X-JobFit-Timeout")
+REQUEST_TIMEOUT = float(os.environ.get("JOBFIT_REQUEST_TIMEOUT", "300"))
+DISCONNECT_POLL = 0.5
 
 app = FastAPI(
     title="CV JD Matcher API",
@@ -43,27 +52,74 @@ class AnalyzeResponse(BaseModel):
     rewrite_data: dict
 
 
+@app.on_event("startup")
+def start_llm_health_checks():
+    POOL.start_health_checks()
+
+
+@app.on_event("shutdown")
+def stop_llm_health_checks():
+    POOL.stop_health_checks()
+
+
 @app.get("/api/health")
 def health_check():
     return {"status": "ok"}
 
 
-@app.post("/api/analyze", response_model=AnalyzeResponse)
-def analyze(request: AnalyzeRequest):
-    try:
+@app.get("/api/llm/hosts")
+def llm_hosts():
+    return {"hosts": POOL.stats(), "calls": POOL.call_stats()}
+
+
+def _run_pipeline(request: AnalyzeRequest, profile: bool, fused: bool, deadline: Deadline) -> AnalyzeResponse:
+    with scope(deadline), maybe_profiled(profile, "analyze"):
         jd_data = normalize_jd_json(extract_jd(request.jd_text))
         cv_data = normalize_cv_json(parse_cv(request.cv_text))
         extra_skills = extract_skills_from_text(request.cv_text)
         cv_data["skills"] = sorted(set(cv_data.get("skills", [])).union(extra_skills))
         match_data = match(jd_data, cv_data)
-        advice_data = generate_advice(jd_data, cv_data, match_data)
-        rewrite_data = rewrite_cv(jd_data, cv_data, match_data)
-        return AnalyzeResponse(
-            jd_data=jd_data,
-            cv_data=cv_data,
-            match_data=match_data,
-            advice_data=advice_data,
-            rewrite_data=rewrite_data,
-        )
+        if fused:
+            advice_data, rewrite_data = advise_and_rewrite(jd_data, cv_data, match_data)
+        else:
+            advice_data = generate_advice(jd_data, cv_data, match_data)
+            rewrite_data = rewrite_cv(jd_data, cv_data, match_data)
+    return AnalyzeResponse(
+        jd_data=jd_data,
+        cv_data=cv_data,
+        match_data=match_data,
+        advice_data=advice_data,
+        rewrite_data=rewrite_data,
+    )
+
+
+@app.post("/api/analyze", response_model=AnalyzeResponse)
+async def analyze(
+    request: AnalyzeRequest,
+    http_request: Request,
+    x_jobfit_profile: Optional[str] = Header(default=None),
+    x_jobfit_timeout: Optional[float] = Header(default=None),
+    x_jobfit_fused: Optional[str] = Header(default=None),
+):
+    # Opt-in profiling: JOBFIT_PROFILE=1 for every request, or "X-JobFit-Profile: 1" per request
+    profile = env_enabled() or flag_enabled(x_jobfit_profile)
+    # Opt-in fused advice + rewrite agent: JOBFIT_FUSED=1, or "X-JobFit-Fused: 1" per request
+    fused = flag_enabled(os.environ.get(FUSED_ENV)) or flag_enabled(x_jobfit_fused)
+
+    # The pipeline runs in a worker thread; a client disconnect cancels the deadline,
+    # which kills the in-flight generation and stops the remaining agent calls.
+    deadline = Deadline(x_jobfit_timeout or REQUEST_TIMEOUT)
+    task = asyncio.ensure_future(asyncio.to_thread(_run_pipeline, request, profile, fused, deadline))
+    while not task.done():
+        await asyncio.wait({task}, timeout=DISCONNECT_POLL)
+        if not task.done() and await http_request.is_disconnected():
+            deadline.cancel("client disconnected")
+
+    try:
+        return task.result()
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=f"Analysis timed out: {str(e)}")
+    except Cancelled as e:
+        raise HTTPException(status_code=499, detail=f"Analysis cancelled: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
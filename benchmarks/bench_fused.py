@@ -0,0 +1,78 @@
+"""
+Fused advice + rewrite (one call) vs separate advice and rewriter calls.
+Needs a running Ollama (`ollama serve`) with llm.MODEL pulled.
+
+    python benchmarks/bench_fused.py --runs 3
+
+Runs the production entry points (advise_and_rewrite vs generate_advice + rewrite_cv)
+and reports wall time, LLM calls, prompt tokens evaluated and tokens generated per applicant.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(os.path.join(os.path.dirname(__file__), ".."))
+
+import llm
+from agents.advice import generate_advice
+from agents.rewriter import rewrite_cv
+from agents.fused import advise_and_rewrite
+from bench_prefix_cache import fake_inputs
+
+_generate = llm.generate
+_calls = []
+
+
+def _recording_generate(*args, **kwargs):
+    data = _generate(*args, **kwargs)
+    _calls.append(data)
+    return data
+
+
+def separate(jd: dict, cv: dict, match: dict):
+    return generate_advice(jd, cv, match), rewrite_cv(jd, cv, match)
+
+
+def measure(fn, jd: dict, cv: dict, match: dict) -> list:
+    _calls.clear()
+    start = time.monotonic()
+    try:
+        fn(jd, cv, match)
+    except ValueError:
+        pass  # unparseable model output still cost the calls we are measuring
+    return [
+        time.monotonic() - start,
+        len(_calls),
+        sum(c.get("prompt_eval_count", 0) for c in _calls),
+        sum(c.get("eval_count", 0) for c in _calls),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # Record per-call token counts from the HTTP path used by call_llm_prefixed
+    llm.generate = _recording_generate
+
+    totals = {"separate": [0.0, 0, 0, 0], "fused": [0.0, 0, 0, 0]}
+    for i in range(args.runs):
+        jd, cv, match = fake_inputs(i)
+        for mode, fn in (("separate", separate), ("fused", advise_and_rewrite)):
+            for k, v in enumerate(measure(fn, jd, cv, match)):
+                totals[mode][k] += v
+
+    n = args.runs
+    for mode, (secs, calls, prompt_tokens, gen_tokens) in totals.items():
+        print(f"{mode:9s} {secs / n:7.2f} s/app  {calls / n:4.1f} calls  "
+              f"{prompt_tokens / n:6.0f} prompt tok  {gen_tokens / n:6.0f} gen tok")
+    sep, fus = totals["separate"][0], totals["fused"][0]
+    if sep:
+        print(f"fused saves {100 * (1 - fus / sep):.1f}% wall time")
+
+
+if __name__ == "__main__":
+    main()
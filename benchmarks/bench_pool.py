@@ -0,0 +1,95 @@
+"""
+Exercise OllamaPool against local fake servers: routing, ejection, retries, re-admission,
+hedging and deadlines.
+
+    python benchmarks/bench_pool.py --requests 200 --workers 8
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ollama_pool import OllamaPool, REQUEST_ERRORS
+from deadlines import Deadline, DeadlineExceeded
+from fake_ollama import FakeOllama
+
+
+def fire(pool: OllamaPool, n: int, workers: int) -> int:
+    def one(_):
+        try:
+            pool.post_json("/api/generate", {"prompt": "x" * 64}, timeout=5)
+            return 0
+        except REQUEST_ERRORS:
+            return 1
+
+    with ThreadPoolExecutor(workers) as ex:
+        return sum(ex.map(one, range(n)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    fakes = [
+        FakeOllama(delay=0.01).start(),
+        FakeOllama(delay=0.05).start(),
+        FakeOllama(delay=0.01).start(),
+    ]
+    pool = OllamaPool([f.url for f in fakes])
+
+    print("== healthy pool (host 1 is 5x slower)")
+    fire(pool, args.requests, args.workers)
+    print(json.dumps(pool.stats(), indent=2))
+
+    print("== host 3 goes down; failed attempts are retried on another host")
+    fakes[2].down = True
+    failed = fire(pool, args.requests, args.workers)
+    print(f"failed requests: {failed}, retries: {pool.call_stats()['retries']}")
+    print(json.dumps([(s["url"], s["healthy"], s["errors"]) for s in pool.stats()]))
+
+    print("== host 3 recovers; health check re-admits it")
+    fakes[2].down = False
+    pool.check_health()
+    fire(pool, args.requests, args.workers)
+    print(json.dumps(pool.stats(), indent=2))
+
+    print("== host 3 passes health checks but fails every generate; probation re-ejects it")
+    fakes[2].fail_rate = 1.0
+    for _ in range(3):
+        pool.check_health()
+        failed = fire(pool, args.requests, args.workers)
+        print(f"failed requests: {failed}, host 3 errors: {pool.stats()[2]['errors']}")
+    fakes[2].fail_rate = 0.0
+    pool.check_health()
+
+    print("== hedging: host 1 stalls at 2s; calls past p95 are duplicated")
+    pool.hedge = True
+    fakes[1].delay = 2.0
+    start = time.monotonic()
+    fire(pool, args.requests, args.workers)
+    print(f"elapsed: {time.monotonic() - start:.2f}s")
+    print(json.dumps(pool.call_stats(), indent=2))
+
+    print("== deadline: every host stalls, 0.5s budget")
+    for f in fakes:
+        f.delay = 5.0
+    start = time.monotonic()
+    try:
+        pool.post_json("/api/generate", {"prompt": "x"}, deadline=Deadline(0.5))
+    except DeadlineExceeded:
+        print(f"deadline exceeded after {time.monotonic() - start:.2f}s; in-flight attempt aborted")
+    print(json.dumps(pool.call_stats(), indent=2))
+
+    for f in fakes:
+        f.delay = 0.0
+        f.stop()
+
+
+if __name__ == "__main__":
+    main()
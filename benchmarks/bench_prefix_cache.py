@@ -0,0 +1,169 @@
+"""
+Per-applicant pipeline cost when one JD is matched against many CVs.
+Needs a running Ollama (`ollama serve`) with llm.MODEL pulled.
+
+    python benchmarks/bench_prefix_cache.py --n 10 [--fused]
+
+Both modes run the real call sequence for every applicant, interleaved as in production:
+extract_jd -> parse_cv -> advice -> rewrite (or the fused call).
+
+baseline: every call through `ollama run` against the first host, with the advice/rewrite
+          prompts laid out as before the shared JD header (instructions first, the JD only
+          in the INPUT block), so consecutive calls diverge at the first token
+pipeline: the production agents; advice/rewrite/fused prompts open with the same JD block
+          and are pinned to one host per JD, so the rewrite call reuses the advice call's
+          prefill even with parse_cv/extract_jd calls in between on other templates
+
+Reports wall time per applicant and prompt tokens evaluated by the advice/rewrite calls
+(`ollama run --verbose` stats for the baseline, the HTTP response for the pipeline).
+The first applicant of each mode warms the model and is excluded from the averages.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(os.path.join(os.path.dirname(__file__), ".."))
+
+import llm
+from scoring import score_match
+from utils import normalize_jd_json, normalize_cv_json
+from agents.jd_extractor import extract_jd
+from agents.cv_parser import parse_cv
+from agents.advice import generate_advice
+from agents.rewriter import rewrite_cv
+from agents.fused import advise_and_rewrite
+
+PROMPT_EVAL = re.compile(r"prompt eval count:\s+(\d+)")
+
+
+def fake_inputs(i: int):
+    jd = {
+        "role_title": "Backend Engineer",
+        "seniority_level": "graduate/early-career",
+        "required_skills": ["Python", "SQL", "Linux", "REST APIs", "Docker"],
+        "preferred_skills": ["Kubernetes", "AWS"],
+        "key_keywords": ["microservices", "high-throughput", "observability", "CI/CD"],
+        "responsibilities": ["Build and operate backend services"] * 5,
+        "red_flags": ["Linux"],
+    }
+    cv = {"candidate_name": f"Candidate {i}", "skills": ["Python", "SQL", f"Skill{i}"], "projects": []}
+    match = {"score": 40 + i % 50, "required_hit": ["python"], "required_missing": ["docker"]}
+    return jd, cv, match
+
+
+def applicant_cv(cv_text: str, i: int) -> str:
+    """Distinct applicants: own name and one extra skill."""
+    return cv_text.replace("Alex Morgan", f"Applicant {i}").replace("C++", f"C++, Skill{i}", 1)
+
+
+# Baseline: the pre-header prompt layout over `ollama run`
+
+def _ollama_run(prompt: str, host: str) -> tuple[str, int]:
+    p = subprocess.run(
+        ["ollama", "run", llm.MODEL, "--verbose"],
+        input=prompt,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="ignore",
+        env={**os.environ, "OLLAMA_HOST": host},
+    )
+    m = PROMPT_EVAL.search(p.stderr or "")
+    return (p.stdout or "").strip(), int(m.group(1)) if m else 0
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _baseline_prompt(name: str, jd: dict, cv: dict, match: dict) -> str:
+    template = _read(f"prompts/{name}.txt").replace(" (jd, above)", " (jd)")
+    template = template.replace("INPUT:\n", "INPUT:\njd = {{JD_JSON}}\n")
+    for tag, data in (("{{JD_JSON}}", jd), ("{{CV_JSON}}", cv), ("{{MATCH_JSON}}", match)):
+        template = template.replace(tag, json.dumps(data, ensure_ascii=False, indent=2))
+    return template
+
+
+def baseline(jd_text: str, cv_text: str, fused: bool, host: str) -> dict:
+    tokens = {}
+    raw, _ = _ollama_run(_read("prompts/jd_extractor.txt").replace("{{JD}}", jd_text), host)
+    jd = normalize_jd_json(raw)
+    raw, _ = _ollama_run(_read("prompts/cv_parser.txt").replace("{{CV}}", cv_text), host)
+    cv = normalize_cv_json(raw)
+    match = score_match(jd, cv)
+    for name in (("fused",) if fused else ("advice", "rewriter")):
+        _, tokens[name] = _ollama_run(_baseline_prompt(name, jd, cv, match), host)
+    return tokens
+
+
+# Pipeline: the production agents, recording the HTTP calls' prompt_eval_count
+
+_generate = llm.generate
+_tokens = []
+
+
+def _recording_generate(*args, **kwargs):
+    data = _generate(*args, **kwargs)
+    _tokens.append(data.get("prompt_eval_count", 0))
+    return data
+
+
+def pipeline(jd_text: str, cv_text: str, fused: bool, host: str) -> dict:
+    jd = normalize_jd_json(extract_jd(jd_text))
+    cv = normalize_cv_json(parse_cv(cv_text))
+    match = score_match(jd, cv)
+    _tokens.clear()
+    if fused:
+        advise_and_rewrite(jd, cv, match)
+    else:
+        generate_advice(jd, cv, match)
+        rewrite_cv(jd, cv, match)
+    return {f"call{k}": t for k, t in enumerate(_tokens)}
+
+
+def run_mode(fn, jd_text: str, cv_text: str, n: int, fused: bool, host: str) -> tuple[float, float]:
+    secs, tokens = 0.0, 0
+    for i in range(n + 1):
+        start = time.monotonic()
+        try:
+            counts = fn(jd_text, applicant_cv(cv_text, i), fused, host)
+        except ValueError:
+            counts = {}  # unparseable model output; the calls were still paid for
+        if i == 0:
+            continue  # warm-up
+        secs += time.monotonic() - start
+        tokens += sum(counts.values())
+    return secs / n, tokens / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=10)
+    parser.add_argument("--jd", default="data/sample_jd.txt")
+    parser.add_argument("--cv", default="data/sample_cv.txt")
+    parser.add_argument("--fused", action="store_true")
+    args = parser.parse_args()
+
+    jd_text, cv_text = _read(args.jd), _read(args.cv)
+    host = llm.POOL.hosts[0].url
+
+    base_s, base_tok = run_mode(baseline, jd_text, cv_text, args.n, args.fused, host)
+    llm.generate = _recording_generate
+    pipe_s, pipe_tok = run_mode(pipeline, jd_text, cv_text, args.n, args.fused, host)
+
+    print(f"applicants: {args.n}  ({'fused' if args.fused else 'advice + rewrite'})")
+    print(f"baseline: {base_s:7.2f} s/app  {base_tok:6.0f} advice/rewrite prompt tok/app")
+    print(f"pipeline: {pipe_s:7.2f} s/app  {pipe_tok:6.0f} advice/rewrite prompt tok/app")
+    if base_s:
+        print(f"wall time saved: {100 * (1 - pipe_s / base_s):.1f}%")
+    print(json.dumps(llm.POOL.call_stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Memory: N parsed CVs held as dicts (json.loads output) vs CVRecord with interned terms.
+
+    python benchmarks/bench_records.py --n 100000
+"""
+import os
+import sys
+import copy
+import json
+import pickle
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from records import CVRecord, JDRecord, TermTable
+from scoring import score_match
+
+SKILLS = [
+    "Python", "C++", "Java", "Rust", "SQL", "Linux/Unix", "Hadoop", "Hive", "MapReduce",
+    "Docker", "Kubernetes", "Git", "React", "TypeScript", "FastAPI", "Machine Learning",
+    "Data Structures", "Algorithms", "Multithreading", "Networking", "TCP/IP", "AWS",
+]
+COURSES = ["Operating Systems", "Databases", "Computer Networks", "Distributed Systems", "Compilers"]
+
+
+def fake_cv_json(rng: random.Random, i: int) -> str:
+    cv = {
+        "candidate_name": f"Candidate {i}",
+        "summary": "Computer science student interested in backend and data systems.",
+        "skills": rng.sample(SKILLS, 10),
+        "coursework": rng.sample(COURSES, 3),
+        "projects": [
+            {
+                "title": f"Project {i}-{j}",
+                "technologies": rng.sample(SKILLS, 4),
+                "bullets": [f"Built component {j} handling {rng.randint(1, 999)}k events/day"],
+            }
+            for j in range(2)
+        ],
+        "experience": [],
+        "achievements": [],
+    }
+    return json.dumps(cv)
+
+
+def check_round_trip() -> None:
+    """to_dict() must emit exactly the keys the input had, including partial nested objects."""
+    cv = {
+        "candidate_name": "Partial",
+        "skills": ["Python", 3, None],
+        "projects": [{"name": "P", "tech": ["Rust"]}, {"title": "Q", "technologies": ["Go"]}, "free text"],
+        "experience": [{"org": "Acme"}, {"title": "Intern", "dates": "2024", "bullets": ["Did X"], "location": "Remote"}],
+        "extra_key": {"kept": True},
+    }
+    jd = {"role_title": "Dev", "red_flags": ["Linux"], "salary": "n/a"}
+    for data, cls in ((cv, CVRecord), (jd, JDRecord)):
+        rec = cls.from_dict(data)
+        assert rec.to_dict() == data
+        # pickle (worker processes) and deepcopy must not leak the missing-key sentinel
+        assert pickle.loads(pickle.dumps(rec)).to_dict() == data
+        assert copy.deepcopy(rec).to_dict() == data
+        json.dumps(pickle.loads(pickle.dumps(rec)).to_dict())
+
+
+def measure(build) -> tuple:
+    tracemalloc.start()
+    objs = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objs, current
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20000)
+    args = parser.parse_args()
+
+    check_round_trip()
+
+    rng = random.Random(0)
+    raw = [fake_cv_json(rng, i) for i in range(args.n)]
+
+    dicts, dict_bytes = measure(lambda: [json.loads(r) for r in raw])
+    table = TermTable()
+    records, rec_bytes = measure(lambda: [CVRecord.from_dict(json.loads(r), table) for r in raw])
+
+    assert all(r.to_dict() == d for r, d in zip(records, dicts))
+
+    jd = {"required_skills": ["Python", "C++"], "preferred_skills": [], "key_keywords": [], "red_flags": ["Linux"]}
+    jd_rec = JDRecord.from_dict(jd, table)
+    for r, d in zip(records[:1000], dicts):
+        assert score_match(jd_rec, r) == score_match(jd, d)
+
+    assert b"TermTable" not in pickle.dumps(records[0]), "pickled record must not carry the TermTable"
+
+    print(f"CVs:           {args.n}")
+    print(f"dict:          {dict_bytes / 1e6:8.1f} MB ({dict_bytes / args.n:.0f} B/CV)")
+    print(f"CVRecord:      {rec_bytes / 1e6:8.1f} MB ({rec_bytes / args.n:.0f} B/CV)")
+    print(f"reduction:     {100 * (1 - rec_bytes / dict_bytes):.1f}%")
+    print(f"interned terms: {len(table)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Minimal fake Ollama server for exercising the pool without a GPU.
+Implements GET /api/version and POST /api/generate.
+
+    python benchmarks/fake_ollama.py --port 11501 --delay 0.05 --fail-rate 0.0
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOllama:
+    """In-process fake; `delay`, `fail_rate` and `down` can be changed while it runs."""
+
+    def __init__(self, port: int = 0, delay: float = 0.0, fail_rate: float = 0.0):
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.down = False
+        self.requests = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if fake.down:
+                    return self._reply(503, {"error": "down"})
+                self._reply(200, {"version": "fake"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                fake.requests += 1
+                if fake.down or random.random() < fake.fail_rate:
+                    return self._reply(500, {"error": "fake failure"})
+                time.sleep(fake.delay)
+                prompt = payload.get("prompt", "")
+                self._reply(200, {
+                    "response": '{"ok": true}',
+                    "prompt_eval_count": len(prompt) // 4,
+                    "prompt_eval_duration": int(fake.delay * 1e9),
+                    "eval_count": 1,
+                })
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "FakeOllama":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=11501)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeOllama(args.port, args.delay, args.fail_rate)
+    print(f"fake ollama on {fake.url}")
+    fake.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Per-request deadline + cancellation, propagated implicitly to every agent call.
+# The HTTP handler (or CLI) opens a scope; llm.call_llm / call_llm_prefixed read it
+# via current() and abort in-flight generations when it expires or is cancelled.
+
+
+class Cancelled(Exception):
+    """The request was cancelled (e.g. the client disconnected)."""
+
+
+class DeadlineExceeded(Cancelled):
+    """The request ran past its deadline."""
+
+
+class Deadline:
+    def __init__(self, seconds: float | None = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+        self.reason = ""
+        self._cancelled = threading.Event()
+
+    def remaining(self) -> float | None:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        self.reason = reason
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def wait(self, timeout: float | None) -> bool:
+        """Sleep up to timeout (bounded by the deadline); True if cancelled meanwhile."""
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return self._cancelled.wait(timeout)
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise Cancelled(self.reason)
+        if self.expired():
+            raise DeadlineExceeded("deadline exceeded")
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("jobfit_deadline", default=None)
+
+
+def current() -> Deadline | None:
+    return _current.get()
+
+
+@contextmanager
+def scope(deadline: Deadline):
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
@@ -0,0 +1,220 @@
+import re
+import zlib
+import random
+import hashlib
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Near-duplicate detection for batch ingestion.
+# Applicant dumps contain resubmissions and whitespace/punctuation-only edits; those reuse
+# the nearest already-parsed result instead of paying another LLM call. MinHash only finds
+# the candidate: a near match is reused only after a word-level diff against the text it
+# came from shows no real change (callers can allow specific changes, e.g. the name).
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows -> LSH candidate threshold ~0.5, verified against `threshold`
+SHINGLE_WORDS = 3
+DEFAULT_THRESHOLD = 0.9
+
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+
+# Words for the reuse diff: case and symbols such as C++ / C# / CI/CD are significant,
+# bare punctuation (bullets, separators) is not
+_WORD = re.compile(r"[+#/\-]*\w[\w+#/\-]*")
+# A name replaced in place must still look like a name (no separators, no line breaks)
+_NAME_CHARS = re.compile(r"[\w .'\-]+")
+
+_rng = random.Random(0x6A6F62)  # fixed seed: signatures are stable across runs
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def _normalize_text(text: str) -> str:
+    t = (text or "").lower()
+    t = re.sub(r"[^a-z0-9+#/\- ]+", " ", t)
+    # Bare symbols (bullet markers, separators) carry no content
+    return " ".join(w for w in t.split() if re.search(r"[a-z0-9]", w))
+
+
+def _shingles(norm: str) -> set:
+    words = norm.split(" ")
+    if len(words) <= SHINGLE_WORDS:
+        return {norm}
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(norm: str) -> Tuple[int, ...]:
+    hashes = [zlib.crc32(s.encode("utf-8")) & _MASK for s in _shingles(norm)]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def same_words(old: str, new: str) -> bool:
+    """True when the two texts differ only in whitespace and punctuation."""
+    return _WORD.findall(old or "") == _WORD.findall(new or "")
+
+
+def _map_position(ops, p: int, len_a: int, len_b: int) -> Optional[int]:
+    for tag, i1, i2, j1, _ in ops:
+        if tag == "equal" and i1 <= p <= i2:
+            return j1 + (p - i1)
+    if p == 0:
+        return 0
+    if p == len_a:
+        return len_b
+    return None
+
+
+def replaced_phrase(old: str, new: str, phrase: str) -> Optional[str]:
+    """
+    If every word-level change from old to new lies inside occurrences of phrase in old,
+    return the text that took the place of its first occurrence in new (may equal phrase).
+    Returns None when anything else changed, or the replacement does not look like a name.
+    """
+    a = list(_WORD.finditer(old or ""))
+    b = list(_WORD.finditer(new or ""))
+    a_words = [m.group() for m in a]
+    b_words = [m.group() for m in b]
+    target = [w.lower() for w in _WORD.findall(phrase or "")]
+    if not target:
+        return None
+
+    lowered = [w.lower() for w in a_words]
+    n = len(target)
+    spans = [(i, i + n) for i in range(len(lowered) - n + 1) if lowered[i:i + n] == target]
+    if not spans:
+        return None
+
+    ops = SequenceMatcher(None, a_words, b_words, autojunk=False).get_opcodes()
+    for tag, i1, i2, _, _ in ops:
+        if tag == "equal":
+            continue
+        # Pure insertions at a boundary are next to the name, not part of it
+        inside = (lambda s, e: s < i1 < e) if tag == "insert" else (lambda s, e: s <= i1 and i2 <= e)
+        if not any(inside(s, e) for s, e in spans):
+            return None
+
+    start, end = spans[0]
+    j1 = _map_position(ops, start, len(a), len(b))
+    j2 = _map_position(ops, end, len(a), len(b))
+    if j1 is None or j2 is None or j1 >= j2:
+        return None
+    replacement = new[b[j1].start():b[j2 - 1].end()]
+    if not _NAME_CHARS.fullmatch(replacement):
+        return None
+    return replacement
+
+
+class NearDupIndex:
+    """MinHash + LSH index over already-processed documents."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._rows = NUM_PERM // BANDS
+        self._exact: Dict[str, int] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(BANDS)]
+        self._sigs: List[Tuple[int, ...]] = []
+        self._values: List[object] = []
+        self._texts: List[str] = []
+
+    def _bands(self, sig):
+        for b in range(BANDS):
+            yield b, sig[b * self._rows:(b + 1) * self._rows]
+
+    def lookup(self, text: str) -> Tuple[Optional[object], Optional[str], float, bool, str, Tuple[int, ...]]:
+        """
+        Returns (value, matched_text, similarity, exact, digest, signature).
+        exact is True only when the normalized text itself was seen before; a MinHash
+        estimate of 1.0 is not proof of identity (e.g. long CVs differing only in the name).
+        value and matched_text are None when nothing at or above the threshold is indexed.
+        """
+        norm = _normalize_text(text)
+        digest = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+        sig = minhash(norm)
+
+        if digest in self._exact:
+            i = self._exact[digest]
+            return self._values[i], self._texts[i], 1.0, True, digest, sig
+
+        best, best_sim = None, 0.0
+        seen = set()
+        for b, key in self._bands(sig):
+            for i in self._buckets[b].get(key, []):
+                if i in seen:
+                    continue
+                seen.add(i)
+                sim = similarity(sig, self._sigs[i])
+                if sim > best_sim:
+                    best, best_sim = i, sim
+
+        if best is not None and best_sim >= self.threshold:
+            return self._values[best], self._texts[best], best_sim, False, digest, sig
+        return None, None, best_sim, False, digest, sig
+
+    def add(self, digest: str, sig: Tuple[int, ...], value: object, text: str) -> None:
+        i = len(self._values)
+        self._values.append(value)
+        self._texts.append(text)
+        self._sigs.append(sig)
+        self._exact.setdefault(digest, i)
+        for b, key in self._bands(sig):
+            self._buckets[b].setdefault(key, []).append(i)
+
+
+def _reuse_if_same_words(text: str, matched_text: str, value: object) -> Optional[object]:
+    return value if same_words(matched_text, text) else None
+
+
+def run_deduped(
+    texts: List[str],
+    fn: Callable[[str], str],
+    threshold: float = DEFAULT_THRESHOLD,
+    index: Optional[NearDupIndex] = None,
+    reuse: Callable[[str, str, object], Optional[object]] = _reuse_if_same_words,
+) -> Tuple[List[str], dict]:
+    """
+    Apply fn (e.g. parse_cv) to every text, reusing the result of the nearest
+    already-processed document when it is an exact or verified near duplicate.
+    reuse(text, matched_text, matched_result) decides every non-exact match: it returns
+    the result to reuse (possibly adjusted, e.g. a new name) or None to run fn.
+    The default only reuses when the texts differ in whitespace/punctuation alone.
+    Returns (results in input order, batch stats).
+    """
+    index = index or NearDupIndex(threshold)
+    results = []
+    stats = {
+        "documents": 0,
+        "llm_calls": 0,
+        "exact_duplicates": 0,
+        "near_duplicates": 0,
+        "rejected_matches": 0,
+        "llm_calls_saved": 0,
+    }
+
+    for text in texts:
+        stats["documents"] += 1
+        value, matched_text, sim, exact, digest, sig = index.lookup(text)
+
+        if value is not None and not exact:
+            value = reuse(text, matched_text, value)
+            if value is None:
+                stats["rejected_matches"] += 1
+            else:
+                # Index the verified copy too, so later identical resubmissions hit exactly
+                index.add(digest, sig, value, text)
+
+        if value is None:
+            value = fn(text)
+            stats["llm_calls"] += 1
+            index.add(digest, sig, value, text)
+        else:
+            stats["llm_calls_saved"] += 1
+            stats["exact_duplicates" if exact else "near_duplicates"] += 1
+
+        results.append(value)
+
+    return results, stats
@@ -1,16 +1,92 @@
+import os
 import subprocess
 
+import deadlines
+from ollama_pool import OllamaPool, REQUEST_ERRORS, urls_from_env, hedge_from_env
+
 MODEL = "llama3.1:8b"
 
-def call_llm(prompt: str) -> str:
-    p = subprocess.Popen(
-        ["ollama", "run", MODEL],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        encoding="utf-8",
-        errors="ignore",
-    )
-    out, _ = p.communicate(prompt)
-    return (out or "").strip()
+# Inference endpoints (OLLAMA_HOSTS=http://a:11434,http://b:11434); defaults to local Ollama.
+# JOBFIT_HEDGE=1 duplicates calls that run past p95 latency onto a second host; each agent
+# passes its own key so the p95 is per agent (a fused call is not judged by a parse's latency).
+POOL = OllamaPool(urls_from_env(), hedge=hedge_from_env())
+
+
+def call_llm(
+    prompt: str,
+    format: dict | str | None = None,
+    affinity: str | None = None,
+    key: str = "cli",
+) -> str:
+    """
+    Run the prompt through `ollama run` on a pooled host; key groups latencies for hedging.
+    The process is killed if the current deadline expires or the request is cancelled.
+    The CLI only supports `--format json`, so a JSON schema format degrades to plain JSON mode.
+    """
+    cmd = ["ollama", "run", MODEL]
+    if format:
+        cmd += ["--format", "json"]
+
+    def run(host, attempt):
+        p = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+            env={**os.environ, "OLLAMA_HOST": host.url},
+        )
+        attempt.on_abort(p.kill)
+        out, err = p.communicate(prompt)
+        if p.returncode != 0:
+            raise RuntimeError(f"ollama run failed ({p.returncode}): {(err or '').strip()[:200]}")
+        return (out or "").strip()
+
+    return POOL.call(run, deadlines.current(), key=key, affinity=affinity)
+
+
+def generate(
+    prompt: str,
+    raw: bool = False,
+    options: dict | None = None,
+    key: str = "generate",
+    format: dict | str | None = None,
+    affinity: str | None = None,
+) -> dict:
+    """
+    POST /api/generate (non-streaming). Returns Ollama's response dict, including
+    response and timing fields such as prompt_eval_count / prompt_eval_duration (ns).
+    Honours the current deadline; key groups latencies for the hedging threshold and
+    affinity keeps calls that share a prompt prefix (one JD) on the same host.
+    format is passed through to constrain the output ("json" or a JSON schema).
+    """
+    payload = {"model": MODEL, "prompt": prompt, "stream": False, "raw": raw}
+    if options:
+        payload["options"] = options
+    if format:
+        payload["format"] = format
+    return POOL.post_json("/api/generate", payload, deadline=deadlines.current(), key=key, affinity=affinity)
+
+
+def call_llm_prefixed(
+    prefix: str,
+    suffix: str,
+    format: dict | str | None = None,
+    affinity: str | None = None,
+    key: str = "prefixed",
+) -> str:
+    """
+    Send prefix + suffix as one templated prompt over the HTTP API.
+    The prefix starts with the shared JD block (see utils.build_prompt_parts), so Ollama's
+    runner reuses its KV cache for it across agents and CVs; pass the JD's affinity key so
+    those calls land on the host that holds that cache.
+    Falls back to the CLI when the HTTP API is unreachable (its latencies are kept apart
+    under "<key>:cli", since they include process start-up).
+    """
+    try:
+        data = generate(prefix + suffix, format=format, affinity=affinity, key=key)
+    except REQUEST_ERRORS:
+        return call_llm(prefix + suffix, format=format, affinity=affinity, key=f"{key}:cli")
+    return (data.get("response") or "").strip()
@@ -8,9 +8,12 @@ from agents.cv_parser import parse_cv
 from agents.matcher import match
 from agents.advice import generate_advice
 from agents.rewriter import rewrite_cv
+from agents.fused import advise_and_rewrite, FUSED_ENV
 
 from utils import normalize_jd_json, normalize_cv_json, extract_skills_from_text
 from report import make_markdown_report
+from profiling import maybe_profiled, env_enabled, flag_enabled, PROFILE_DIR_ENV
+from deadlines import Deadline, scope
 
 
 def read_file(path: str) -> str:
@@ -33,22 +36,34 @@ def main():
     parser.add_argument("--jd", default="data/jd.txt")
     parser.add_argument("--cv", default="data/cv.txt")
     parser.add_argument("--out", default="outputs")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the pipeline (cProfile + tracemalloc); artifacts go to $JOBFIT_PROFILE_DIR or <out>/profiles")
+    parser.add_argument("--fused", action="store_true",
+                        help="produce advice + rewrite in a single LLM call")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="overall deadline in seconds; in-flight LLM calls are killed when it expires")
     args = parser.parse_args()
 
     jd_text = read_file(args.jd)
     cv_text = read_file(args.cv)
 
-    jd_data = normalize_jd_json(extract_jd(jd_text))
-    cv_data = normalize_cv_json(parse_cv(cv_text))
+    profile = args.profile or env_enabled()
+    profile_dir = os.environ.get(PROFILE_DIR_ENV) or os.path.join(args.out, "profiles")
+    with scope(Deadline(args.timeout)), maybe_profiled(profile, "main", profile_dir) as artifacts:
+        jd_data = normalize_jd_json(extract_jd(jd_text))
+        cv_data = normalize_cv_json(parse_cv(cv_text))
 
-    extra_skills = extract_skills_from_text(cv_text)
-    cv_data["skills"] = sorted(set(cv_data.get("skills", [])).union(extra_skills))
+        extra_skills = extract_skills_from_text(cv_text)
+        cv_data["skills"] = sorted(set(cv_data.get("skills", [])).union(extra_skills))
 
-    match_data = match(jd_data, cv_data)
-    advice_data = generate_advice(jd_data, cv_data, match_data)
-    rewrite_data = rewrite_cv(jd_data, cv_data, match_data)
+        match_data = match(jd_data, cv_data)
+        if args.fused or flag_enabled(os.environ.get(FUSED_ENV)):
+            advice_data, rewrite_data = advise_and_rewrite(jd_data, cv_data, match_data)
+        else:
+            advice_data = generate_advice(jd_data, cv_data, match_data)
+            rewrite_data = rewrite_cv(jd_data, cv_data, match_data)
 
-    md = make_markdown_report(jd_data, cv_data, match_data, advice_data, rewrite_data)
+        md = make_markdown_report(jd_data, cv_data, match_data, advice_data, rewrite_data)
 
     os.makedirs(args.out, exist_ok=True)
     stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -59,6 +74,10 @@ def main():
     print("\n✅ Generated report + rewritten CV\n")
     print(md)
 
+    if artifacts.get("profile"):
+        print(f"\n⏱️  Profile: {artifacts['profile']}")
+        print(f"⏱️  Summary: {artifacts['summary']}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,429 @@
+import os
+import json
+import time
+import socket
+import threading
+import contextvars
+import http.client
+import urllib.parse
+import urllib.request
+import urllib.error
+from collections import OrderedDict, deque
+
+from deadlines import Deadline, Cancelled
+from profiling import thread_profiled
+
+# Pool of Ollama endpoints.
+# Routing: least outstanding requests among healthy hosts (ties -> lower latency EWMA).
+# Calls with an affinity key (e.g. one JD) stick to the host that served the key last,
+# unless it is down or AFFINITY_SLACK calls busier than the best host, so that host's
+# prompt-prefix cache stays warm for the whole per-applicant call sequence.
+# A host is ejected after MAX_FAILURES consecutive errors (calls or health checks)
+# and re-admitted once a periodic health check succeeds again, on probation: its next
+# failed call ejects it again. 4xx responses are the request's fault, not the host's.
+# A call that fails with a request error is retried once on another healthy host.
+# Calls honour the caller's Deadline: expiry or cancellation aborts the in-flight
+# attempt (socket shutdown / process kill). With hedging on, a call still running
+# after the observed p95 latency is duplicated on another host; the first success wins.
+
+DEFAULT_URL = "http://localhost:11434"
+HEALTH_PATH = "/api/version"
+HEALTH_INTERVAL = 10.0
+HEALTH_TIMEOUT = 2.0
+MAX_FAILURES = 3
+EWMA_ALPHA = 0.2
+
+POLL_INTERVAL = 0.1
+LATENCY_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 0.95
+
+AFFINITY_SLACK = 1
+AFFINITY_KEYS = 1024
+
+REQUEST_ERRORS = (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError)
+
+
+def _client_error(e: BaseException | None) -> bool:
+    return isinstance(e, urllib.error.HTTPError) and 400 <= e.code < 500
+
+
+class Host:
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.latency_total = 0.0
+        self.latency_ewma = 0.0
+        self.last_error = ""
+
+    def stats(self) -> dict:
+        ok = self.requests - self.errors
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "avg_latency_ms": round(1000 * self.latency_total / ok, 1) if ok else None,
+            "ewma_latency_ms": round(1000 * self.latency_ewma, 1),
+            "last_error": self.last_error,
+        }
+
+
+class Attempt:
+    """One try of a call on one host; abort() runs the registered callbacks exactly once."""
+
+    def __init__(self, host: Host):
+        self.host = host
+        self.start = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.aborted = False
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def on_abort(self, callback) -> None:
+        with self._lock:
+            if not self.aborted:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def abort(self) -> None:
+        with self._lock:
+            if self.aborted:
+                return
+            self.aborted = True
+            callbacks = list(self._callbacks)
+        for cb in callbacks:
+            try:
+                cb()
+            except OSError:
+                pass
+
+
+def _http_post(host: Host, attempt: Attempt, path: str, body: bytes, timeout: float | None) -> dict:
+    u = urllib.parse.urlsplit(host.url)
+    if u.scheme == "https":
+        conn = http.client.HTTPSConnection(u.hostname, u.port or 443, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(u.hostname, u.port or 80, timeout=timeout)
+
+    def shutdown():
+        if conn.sock is not None:
+            conn.sock.shutdown(socket.SHUT_RDWR)
+
+    try:
+        try:
+            conn.connect()
+            attempt.on_abort(shutdown)
+            if attempt.aborted:
+                raise Cancelled("aborted")
+            conn.request("POST", u.path.rstrip("/") + path, body=body, headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            data = resp.read()
+        except OSError as e:
+            # DNS failures, unreachable hosts etc. are plain OSError here; wrap them like urllib does
+            raise urllib.error.URLError(e) from e
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(host.url + path, resp.status, resp.reason, resp.headers, None)
+        return json.loads(data.decode("utf-8"))
+    finally:
+        conn.close()
+
+
+class OllamaPool:
+    def __init__(self, urls: list[str], max_failures: int = MAX_FAILURES, hedge: bool = False):
+        if not urls:
+            raise ValueError("OllamaPool needs at least one URL")
+        self.hosts = [Host(u) for u in urls]
+        self.max_failures = max_failures
+        self.hedge = hedge
+        self._lock = threading.Lock()
+        self._health_thread = None
+        self._health_started = False
+        self._stop = threading.Event()
+        self._latencies: dict[str, deque] = {}
+        self._affinity: OrderedDict[str, Host] = OrderedDict()
+        self.counters = {
+            "calls": 0,
+            "affinity_hits": 0,
+            "retries": 0,
+            "hedges_sent": 0,
+            "hedges_won": 0,
+            "cancelled_attempts": 0,
+            "deadline_exceeded": 0,
+            "client_cancelled": 0,
+        }
+
+    # Routing
+
+    def acquire(self, exclude: tuple = (), healthy_only: bool = False, affinity: str | None = None) -> Host | None:
+        """
+        Pick the least-loaded healthy host (all hosts if none are healthy) and count it as busy.
+        With an affinity key, the host that served that key last is kept while it qualifies.
+        Returns None only when exclude/healthy_only leave nothing to pick.
+        Starts the periodic health checks on first use, so CLI and batch runs re-admit hosts too.
+        """
+        if not self._health_started:
+            self.start_health_checks()
+        with self._lock:
+            hosts = [h for h in self.hosts if h not in exclude]
+            candidates = [h for h in hosts if h.healthy] or ([] if healthy_only else hosts)
+            if not candidates:
+                return None
+            host = min(candidates, key=lambda h: (h.outstanding, h.latency_ewma))
+            if affinity is not None:
+                pinned = self._affinity.get(affinity)
+                if pinned in candidates and pinned.outstanding <= host.outstanding + AFFINITY_SLACK:
+                    host = pinned
+                    self.counters["affinity_hits"] += 1
+                self._affinity[affinity] = host
+                self._affinity.move_to_end(affinity)
+                if len(self._affinity) > AFFINITY_KEYS:
+                    self._affinity.popitem(last=False)
+            host.outstanding += 1
+            return host
+
+    def release(self, host: Host, ok: bool, latency: float, error: str = "", host_fault: bool = True) -> None:
+        with self._lock:
+            host.outstanding -= 1
+            host.requests += 1
+            if ok:
+                host.consecutive_failures = 0
+                host.latency_total += latency
+                first_success = host.requests - host.errors == 1
+                host.latency_ewma = latency if first_success else (
+                    EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * host.latency_ewma
+                )
+            else:
+                host.errors += 1
+                host.last_error = error
+                if host_fault:
+                    self._record_failure(host)
+
+    def release_cancelled(self, host: Host) -> None:
+        """An attempt we aborted ourselves; not the host's fault, so no failure is recorded."""
+        with self._lock:
+            host.outstanding -= 1
+            host.cancelled += 1
+            self.counters["cancelled_attempts"] += 1
+
+    def _record_failure(self, host: Host) -> None:
+        host.consecutive_failures += 1
+        if host.consecutive_failures >= self.max_failures:
+            host.healthy = False
+
+    # Calls (deadline, cancellation, hedging)
+
+    def _hedge_delay(self, key: str) -> float | None:
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(HEDGE_PERCENTILE * len(samples)))]
+
+    def _launch(
+        self,
+        fn,
+        finished: threading.Event,
+        exclude: tuple = (),
+        healthy_only: bool = False,
+        affinity: str | None = None,
+    ):
+        host = self.acquire(exclude, healthy_only, affinity)
+        if host is None:
+            return None
+        attempt = Attempt(host)
+        # Attempt threads inherit the caller's context (e.g. an active profiled run)
+        ctx = contextvars.copy_context()
+
+        def run():
+            try:
+                with thread_profiled():
+                    attempt.result = fn(host, attempt)
+            except Exception as e:
+                attempt.error = e
+            latency = time.monotonic() - attempt.start
+            if attempt.aborted:
+                self.release_cancelled(host)
+            else:
+                self.release(
+                    host,
+                    attempt.error is None,
+                    latency,
+                    str(attempt.error or ""),
+                    host_fault=not _client_error(attempt.error),
+                )
+            attempt.done.set()
+            finished.set()
+
+        threading.Thread(target=ctx.run, args=(run,), name=f"ollama-call-{host.url}", daemon=True).start()
+        return attempt
+
+    def call(self, fn, deadline: Deadline | None = None, key: str = "default", affinity: str | None = None):
+        """
+        Run fn(host, attempt) on a pooled host and return its result.
+        affinity keeps calls with the same key on one host (hedges always go elsewhere).
+        fn must register attempt.on_abort(...) so that its blocking work can be interrupted.
+        A request error (not a 4xx) is retried once on another healthy host.
+        Raises Cancelled / DeadlineExceeded from the deadline, or the last attempt's own error.
+        """
+        if deadline is not None:
+            deadline.check()
+        with self._lock:
+            self.counters["calls"] += 1
+
+        finished = threading.Event()
+        started = time.monotonic()
+        attempts = [self._launch(fn, finished, affinity=affinity)]
+        hedge_after = self._hedge_delay(key) if self.hedge and len(self.hosts) > 1 else None
+        hedge = None
+        retried = False
+
+        while True:
+            winner = next((a for a in attempts if a.done.is_set() and a.error is None), None)
+            if winner is not None:
+                for a in attempts:
+                    if a is not winner:
+                        a.abort()
+                with self._lock:
+                    self._latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(
+                        time.monotonic() - started
+                    )
+                    if winner is hedge:
+                        self.counters["hedges_won"] += 1
+                return winner.result
+
+            live = [a for a in attempts if not a.done.is_set()]
+            if not live:
+                error = attempts[-1].error
+                if retried or not isinstance(error, REQUEST_ERRORS) or _client_error(error):
+                    raise error
+                if deadline is not None:
+                    deadline.check()
+                retried = True
+                retry = self._launch(
+                    fn, finished, exclude=tuple(a.host for a in attempts), healthy_only=True
+                )
+                if retry is None:
+                    raise error
+                attempts.append(retry)
+                hedge_after = None
+                with self._lock:
+                    self.counters["retries"] += 1
+                continue
+
+            if deadline is not None and (deadline.cancelled or deadline.expired()):
+                for a in live:
+                    a.abort()
+                with self._lock:
+                    self.counters["client_cancelled" if deadline.cancelled else "deadline_exceeded"] += 1
+                deadline.check()
+
+            if hedge_after is not None and len(attempts) == 1 and time.monotonic() - started >= hedge_after:
+                hedge = self._launch(fn, finished, exclude=(attempts[0].host,), healthy_only=True)
+                hedge_after = None
+                if hedge is not None:
+                    attempts.append(hedge)
+                    with self._lock:
+                        self.counters["hedges_sent"] += 1
+
+            timeout = POLL_INTERVAL
+            if hedge_after is not None:
+                timeout = min(timeout, max(0.0, started + hedge_after - time.monotonic()))
+            if deadline is not None and deadline.remaining() is not None:
+                timeout = min(timeout, deadline.remaining())
+            finished.wait(timeout)
+            finished.clear()
+
+    def post_json(
+        self,
+        path: str,
+        payload: dict,
+        timeout: float | None = None,
+        deadline: Deadline | None = None,
+        key: str | None = None,
+        affinity: str | None = None,
+    ) -> dict:
+        """POST JSON to a pooled host; errors are recorded against the host and re-raised."""
+        body = json.dumps(payload).encode("utf-8")
+        return self.call(
+            lambda host, attempt: _http_post(host, attempt, path, body, timeout),
+            deadline,
+            key or path,
+            affinity,
+        )
+
+    # Health checks
+
+    def check_health(self) -> None:
+        for host in self.hosts:
+            try:
+                with urllib.request.urlopen(host.url + HEALTH_PATH, timeout=HEALTH_TIMEOUT):
+                    pass
+                ok, error = True, ""
+            except REQUEST_ERRORS as e:
+                ok, error = False, str(e)
+
+            with self._lock:
+                if ok:
+                    # Only a successful call clears call failures; a re-admitted host is on
+                    # probation, since /api/version passing doesn't prove generate works
+                    if not host.healthy:
+                        host.healthy = True
+                        host.consecutive_failures = self.max_failures - 1
+                else:
+                    host.last_error = error
+                    self._record_failure(host)
+
+    def start_health_checks(self, interval: float = HEALTH_INTERVAL) -> None:
+        with self._lock:
+            if self._health_thread is not None:
+                return
+            self._health_started = True
+            self._stop.clear()
+
+            def loop():
+                while not self._stop.wait(interval):
+                    self.check_health()
+
+            self._health_thread = threading.Thread(target=loop, name="ollama-health", daemon=True)
+            self._health_thread.start()
+
+    def stop_health_checks(self) -> None:
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            return [h.stats() for h in self.hosts]
+
+    def call_stats(self) -> dict:
+        with self._lock:
+            out = dict(self.counters)
+            out["hedge_after_ms"] = {}
+        for key in list(self._latencies):
+            delay = self._hedge_delay(key)
+            out["hedge_after_ms"][key] = round(1000 * delay, 1) if delay is not None else None
+        return out
+
+
+def urls_from_env() -> list[str]:
+    """OLLAMA_HOSTS is a comma-separated list; falls back to OLLAMA_URL, then localhost."""
+    hosts = os.environ.get("OLLAMA_HOSTS", "")
+    urls = [u.strip() for u in hosts.split(",") if u.strip()]
+    return urls or [os.environ.get("OLLAMA_URL", DEFAULT_URL)]
+
+
+def hedge_from_env() -> bool:
+    return os.environ.get("JOBFIT_HEDGE", "").strip().lower() in {"1", "true", "yes", "on"}
@@ -0,0 +1,147 @@
+import io
+import os
+import sys
+import pstats
+import cProfile
+import tracemalloc
+import threading
+import contextvars
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Opt-in profiling for a single pipeline run.
+# Off by default: callers use maybe_profiled(), which is a nullcontext unless enabled,
+# so un-profiled runs never touch cProfile or tracemalloc.
+# Only one profiled run is active per process. tracemalloc (and, on Python 3.12+, cProfile)
+# is process-wide, so a second concurrent opt-in runs unprofiled instead of failing or
+# mixing its data into the first. While a profiled run is active, concurrent requests
+# still pay tracemalloc overhead and their allocations appear in its summary.
+
+PROFILE_ENV = "JOBFIT_PROFILE"
+PROFILE_DIR_ENV = "JOBFIT_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "profiles"
+TOP_N = 25
+TRACE_FRAMES = 10
+
+_profile_lock = threading.Lock()
+
+# Per-thread profiles collected from worker threads (e.g. LLM pool attempts) of the active run
+_thread_profiles: contextvars.ContextVar = contextvars.ContextVar("jobfit_thread_profiles", default=None)
+
+
+def flag_enabled(value: str | None) -> bool:
+    return (value or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def env_enabled() -> bool:
+    return flag_enabled(os.environ.get(PROFILE_ENV))
+
+
+def _summary(label: str, stats: pstats.Stats, snapshot, top_n: int) -> str:
+    buf = io.StringIO()
+    buf.write(f"# Profile: {label}\n\n")
+
+    buf.write(f"## Top {top_n} functions by cumulative time\n")
+    stats.stream = buf
+    stats.sort_stats("cumulative").print_stats(top_n)
+
+    buf.write(f"\n## Top {top_n} functions by own time\n")
+    stats.sort_stats("tottime").print_stats(top_n)
+
+    buf.write(f"\n## Top {top_n} allocation sites\n")
+    if snapshot is None:
+        buf.write("- tracemalloc was already tracing; allocations not sampled\n")
+    else:
+        buf.write("- sampled process-wide: concurrent requests are included\n")
+        for stat in snapshot.statistics("lineno")[:top_n]:
+            buf.write(f"- {stat}\n")
+
+    return buf.getvalue()
+
+
+@contextmanager
+def profiled(label: str = "pipeline", out_dir: str | None = None, top_n: int = TOP_N):
+    """
+    Run the enclosed block under cProfile + tracemalloc.
+    Writes <out_dir>/<label>_<stamp>.prof (load with pstats/snakeviz) and a matching _summary.txt.
+    Yields a dict that is filled with the artifact paths on exit, or with
+    {"skipped": reason} if another profiled run is already active.
+    """
+    out_dir = out_dir or os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+    artifacts = {}
+
+    if not _profile_lock.acquire(blocking=False):
+        artifacts["skipped"] = "another profiled run is in progress"
+        yield artifacts
+        return
+
+    owns_tracemalloc = not tracemalloc.is_tracing()
+    if owns_tracemalloc:
+        tracemalloc.start(TRACE_FRAMES)
+
+    prof = cProfile.Profile()
+    try:
+        prof.enable()
+    except ValueError:
+        # Python 3.12+: another profiler (e.g. a debugger) already owns the interpreter
+        if owns_tracemalloc:
+            tracemalloc.stop()
+        _profile_lock.release()
+        artifacts["skipped"] = "another profiler is active"
+        yield artifacts
+        return
+
+    collected = []
+    token = _thread_profiles.set(collected)
+    try:
+        yield artifacts
+    finally:
+        prof.disable()
+        _thread_profiles.reset(token)
+        snapshot = None
+        if owns_tracemalloc:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ])
+            tracemalloc.stop()
+        _profile_lock.release()
+
+        os.makedirs(out_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        base = os.path.join(out_dir, f"{label}_{stamp}")
+
+        stats = pstats.Stats(prof)
+        for thread_prof in list(collected):
+            stats.add(thread_prof)
+        stats.dump_stats(base + ".prof")
+        with open(base + "_summary.txt", "w", encoding="utf-8") as f:
+            f.write(_summary(label, stats, snapshot, top_n))
+
+        artifacts["profile"] = base + ".prof"
+        artifacts["summary"] = base + "_summary.txt"
+
+
+@contextmanager
+def thread_profiled():
+    """
+    Profile the current worker thread into the active profiled run, if any.
+    Before Python 3.12 cProfile only sees the thread that enabled it; from 3.12 it is
+    interpreter-wide and already covers worker threads, so this is a no-op there.
+    """
+    collected = _thread_profiles.get()
+    if collected is None or sys.version_info >= (3, 12):
+        yield
+        return
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        collected.append(prof)
+
+
+def maybe_profiled(enabled: bool, label: str = "pipeline", out_dir: str | None = None):
+    return profiled(label, out_dir) if enabled else nullcontext({})
@@ -0,0 +1,260 @@
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+# Compact representations of the normalize_cv_json / normalize_jd_json schemas.
+# Short repeated phrases (skills, keywords, technologies) are interned into a
+# shared TermTable and stored as arrays of small integer ids, so batch runs over
+# many CVs keep one copy of "Python" instead of millions.
+
+
+class TermTable:
+    """Bidirectional string <-> int id table."""
+
+    __slots__ = ("_ids", "_terms")
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def intern(self, term: str) -> int:
+        i = self._ids.get(term)
+        if i is None:
+            i = len(self._terms)
+            self._ids[term] = i
+            self._terms.append(term)
+        return i
+
+    def term(self, i: int) -> str:
+        return self._terms[i]
+
+
+# Default table shared by every record unless one is passed explicitly
+TERMS = TermTable()
+
+
+def _encode_terms(table: TermTable, items):
+    """
+    list[str] -> array of term ids.
+    Anything that is not a clean list of strings is kept as-is so to_dict() stays lossless.
+    """
+    if isinstance(items, list) and all(isinstance(x, str) for x in items):
+        return array("I", [table.intern(x) for x in items])
+    return items
+
+
+def _decode_terms(table: TermTable, ids):
+    if isinstance(ids, array):
+        return [table.term(i) for i in ids]
+    if isinstance(ids, list):
+        return list(ids)
+    return ids
+
+
+def _encode_strs(items):
+    """Long, mostly unique strings (bullets, responsibilities) are kept as a tuple, not interned."""
+    if isinstance(items, list) and all(isinstance(x, str) for x in items):
+        return tuple(items)
+    return items
+
+
+def _decode_strs(items):
+    if isinstance(items, (tuple, list)):
+        return list(items)
+    return items
+
+
+def _iter_terms(table: TermTable, ids) -> Iterator:
+    """Distinct terms of an interned field, read straight from the id array."""
+    if isinstance(ids, array):
+        return (table.term(i) for i in set(ids))
+    if isinstance(ids, list):
+        return iter(ids)
+    return iter(())
+
+
+class _Missing:
+    """Marks a schema key that was absent from the input, so to_dict() doesn't invent it."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+    def __reduce__(self):
+        # pickle / copy resolve this back to the module singleton, keeping `is _MISSING` valid
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+def _emit(out: dict, extra: Optional[dict]) -> dict:
+    out = {k: v for k, v in out.items() if v is not _MISSING}
+    if extra:
+        out.update(extra)
+    return out
+
+
+def _extra(data: dict, known: tuple) -> Optional[dict]:
+    extra = {k: v for k, v in data.items() if k not in known}
+    return extra or None
+
+
+class ProjectRecord:
+    FIELDS = ("title", "technologies", "bullets")
+
+    __slots__ = ("title", "technologies", "bullets", "extra", "_table")
+
+    @classmethod
+    def from_dict(cls, data: dict, table: TermTable = TERMS) -> "ProjectRecord":
+        r = cls.__new__(cls)
+        r._table = table
+        r.title = data.get("title", _MISSING)
+        r.technologies = _encode_terms(table, data.get("technologies", _MISSING))
+        r.bullets = _encode_strs(data.get("bullets", _MISSING))
+        r.extra = _extra(data, cls.FIELDS)
+        return r
+
+    def to_dict(self) -> dict:
+        out = {
+            "title": self.title,
+            "technologies": _decode_terms(self._table, self.technologies),
+            "bullets": _decode_strs(self.bullets),
+        }
+        return _emit(out, self.extra)
+
+    def terms(self, field: str) -> Iterator:
+        return _iter_terms(self._table, getattr(self, field))
+
+    def __reduce__(self):
+        return self.__class__.from_dict, (self.to_dict(),)
+
+
+class ExperienceRecord:
+    FIELDS = ("title", "org", "dates", "bullets")
+
+    __slots__ = ("title", "org", "dates", "bullets", "extra")
+
+    @classmethod
+    def from_dict(cls, data: dict, table: TermTable = TERMS) -> "ExperienceRecord":
+        r = cls.__new__(cls)
+        r.title = data.get("title", _MISSING)
+        r.org = data.get("org", _MISSING)
+        r.dates = data.get("dates", _MISSING)
+        r.bullets = _encode_strs(data.get("bullets", _MISSING))
+        r.extra = _extra(data, cls.FIELDS)
+        return r
+
+    def to_dict(self) -> dict:
+        out = {
+            "title": self.title,
+            "org": self.org,
+            "dates": self.dates,
+            "bullets": _decode_strs(self.bullets),
+        }
+        return _emit(out, self.extra)
+
+
+def _encode_items(cls, items, table: TermTable):
+    """Nested project/experience objects; non-dict entries are kept verbatim."""
+    if not isinstance(items, list):
+        return items
+    return tuple(cls.from_dict(x, table) if isinstance(x, dict) else x for x in items)
+
+
+def _decode_items(items):
+    if not isinstance(items, tuple):
+        return items
+    return [x.to_dict() if hasattr(x, "to_dict") else x for x in items]
+
+
+class CVRecord:
+    """Slotted, interned form of normalize_cv_json() output."""
+
+    FIELDS = ("candidate_name", "summary", "skills", "coursework", "projects", "experience", "achievements")
+
+    __slots__ = FIELDS + ("extra", "_table")
+
+    @classmethod
+    def from_dict(cls, data: dict, table: TermTable = TERMS) -> "CVRecord":
+        r = cls.__new__(cls)
+        r._table = table
+        r.candidate_name = data.get("candidate_name", _MISSING)
+        r.summary = data.get("summary", _MISSING)
+        r.skills = _encode_terms(table, data.get("skills", _MISSING))
+        r.coursework = _encode_terms(table, data.get("coursework", _MISSING))
+        r.projects = _encode_items(ProjectRecord, data.get("projects", _MISSING), table)
+        r.experience = _encode_items(ExperienceRecord, data.get("experience", _MISSING), table)
+        r.achievements = _encode_strs(data.get("achievements", _MISSING))
+        r.extra = _extra(data, cls.FIELDS)
+        return r
+
+    def to_dict(self) -> dict:
+        t = self._table
+        out = {
+            "candidate_name": self.candidate_name,
+            "summary": self.summary,
+            "skills": _decode_terms(t, self.skills),
+            "coursework": _decode_terms(t, self.coursework),
+            "projects": _decode_items(self.projects),
+            "experience": _decode_items(self.experience),
+            "achievements": _decode_strs(self.achievements),
+        }
+        return _emit(out, self.extra)
+
+    def terms(self, field: str) -> Iterator:
+        """Distinct terms of an interned list field, without decoding the rest of the record."""
+        return _iter_terms(self._table, getattr(self, field))
+
+    def __reduce__(self):
+        # Pickle the plain dict, not the shared TermTable; terms are re-interned into TERMS on load
+        return self.__class__.from_dict, (self.to_dict(),)
+
+
+class JDRecord:
+    """Slotted, interned form of normalize_jd_json() output."""
+
+    FIELDS = (
+        "role_title", "seniority_level", "required_skills", "preferred_skills",
+        "key_keywords", "responsibilities", "red_flags",
+    )
+
+    __slots__ = FIELDS + ("extra", "_table")
+
+    @classmethod
+    def from_dict(cls, data: dict, table: TermTable = TERMS) -> "JDRecord":
+        r = cls.__new__(cls)
+        r._table = table
+        r.role_title = data.get("role_title", _MISSING)
+        r.seniority_level = data.get("seniority_level", _MISSING)
+        r.required_skills = _encode_terms(table, data.get("required_skills", _MISSING))
+        r.preferred_skills = _encode_terms(table, data.get("preferred_skills", _MISSING))
+        r.key_keywords = _encode_terms(table, data.get("key_keywords", _MISSING))
+        r.responsibilities = _encode_strs(data.get("responsibilities", _MISSING))
+        r.red_flags = _encode_terms(table, data.get("red_flags", _MISSING))
+        r.extra = _extra(data, cls.FIELDS)
+        return r
+
+    def to_dict(self) -> dict:
+        t = self._table
+        out = {
+            "role_title": self.role_title,
+            "seniority_level": self.seniority_level,
+            "required_skills": _decode_terms(t, self.required_skills),
+            "preferred_skills": _decode_terms(t, self.preferred_skills),
+            "key_keywords": _decode_terms(t, self.key_keywords),
+            "responsibilities": _decode_strs(self.responsibilities),
+            "red_flags": _decode_terms(t, self.red_flags),
+        }
+        return _emit(out, self.extra)
+
+    def terms(self, field: str) -> Iterator:
+        """Distinct terms of an interned list field, without decoding the rest of the record."""
+        return _iter_terms(self._table, getattr(self, field))
+
+    def __reduce__(self):
+        # Pickle the plain dict, not the shared TermTable; terms are re-interned into TERMS on load
+        return self.__class__.from_dict, (self.to_dict(),)
@@ -1,6 +1,8 @@
 import re
 from typing import Dict, List, Set
 
+from records import CVRecord, JDRecord, ProjectRecord
+
 # Canonicalization: collapse near-duplicates so the report is clean + honest
 CANON = {
     # algorithms variants
@@ -170,15 +172,11 @@ def _add_base_if_alias_present(terms: Set[str]) -> Set[str]:
                 expanded.add(b)
     return expanded
 
-def _enrich_cv_terms_from_bullets(cv: Dict) -> Set[str]:
-    """Pull signal terms from project bullets so we don’t rely only on the skills list."""
+def _bullet_terms(bullet_lists) -> Set[str]:
     bullet_terms: Set[str] = set()
 
-    for p in cv.get("projects", []) or []:
-        if not isinstance(p, dict):
-            continue
-        bullets = p.get("bullets", []) or []
-        for b in bullets:
+    for bullets in bullet_lists:
+        for b in bullets or []:
             b_n = (b or "").lower()
             for phrase in BULLET_PHRASES:
                 if phrase in b_n:
@@ -186,17 +184,30 @@ def _enrich_cv_terms_from_bullets(cv: Dict) -> Set[str]:
 
     return bullet_terms
 
-def _unique_sorted(items) -> List[str]:
-    return sorted(set(items))
+def _enrich_cv_terms_from_bullets(cv: Dict) -> Set[str]:
+    """Pull signal terms from project bullets so we don’t rely only on the skills list."""
+    return _bullet_terms(
+        p.get("bullets", []) for p in cv.get("projects", []) or [] if isinstance(p, dict)
+    )
 
-def score_match(jd: Dict, cv: Dict) -> Dict:
-    # JD sets
-    req = _set(jd.get("required_skills", []))
-    pref = _set(jd.get("preferred_skills", []))
-    keywords = _set(jd.get("key_keywords", []))
-    red_flags = _set(jd.get("red_flags", []))
+def _jd_sets(jd) -> tuple:
+    """(required, preferred, keywords, red_flags) term sets from a JD dict or JDRecord."""
+    fields = ("required_skills", "preferred_skills", "key_keywords", "red_flags")
+    if isinstance(jd, JDRecord):
+        # Straight from the interned id arrays; each distinct term is normalized once
+        return tuple(_set(jd.terms(f)) for f in fields)
+    return tuple(_set(jd.get(f, [])) for f in fields)
+
+def _cv_terms(cv) -> Set[str]:
+    """Skills + coursework + project technologies + bullet signals from a CV dict or CVRecord."""
+    if isinstance(cv, CVRecord):
+        projects = [p for p in cv.projects if isinstance(p, ProjectRecord)] if isinstance(cv.projects, tuple) else []
+        cv_tech: Set[str] = set()
+        for p in projects:
+            cv_tech |= _set(p.terms("technologies"))
+        bullets = _bullet_terms(p.bullets for p in projects if isinstance(p.bullets, (tuple, list)))
+        return _set(cv.terms("skills")) | _set(cv.terms("coursework")) | cv_tech | bullets
 
-    # CV sets (skills + coursework + project technologies + bullet signals)
     cv_skills = _set(cv.get("skills", []))
     cv_course = _set(cv.get("coursework", []))
 
@@ -208,7 +219,17 @@ def score_match(jd: Dict, cv: Dict) -> Dict:
 
     cv_bullets = _enrich_cv_terms_from_bullets(cv)
 
-    cv_all = cv_skills | cv_course | cv_tech | cv_bullets
+    return cv_skills | cv_course | cv_tech | cv_bullets
+
+def _unique_sorted(items) -> List[str]:
+    return sorted(set(items))
+
+def score_match(jd: Dict, cv: Dict) -> Dict:
+    # JD sets (dicts or compact records from records.py)
+    req, pref, keywords, red_flags = _jd_sets(jd)
+
+    # CV sets (skills + coursework + project technologies + bullet signals)
+    cv_all = _cv_terms(cv)
 
     # Expand/normalize in both directions (aliases count)
     req = _add_base_if_alias_present(_expand_terms_if_base_present(req))
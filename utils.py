@@ -1,5 +1,6 @@
 import json
 import re
+import hashlib
 
 def _extract_json_object(raw: str) -> str:
     """
@@ -63,6 +64,37 @@ def normalize_cv_json(raw: str) -> dict:
 
     return data
 
+JD_HEADER_PATH = "prompts/jd_header.txt"
+
+def jd_affinity(jd_data: dict) -> str:
+    """Stable key for a JD; calls sharing it are routed to the same host so its prefix cache is warm."""
+    jd_json = json.dumps(jd_data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(jd_json.encode("utf-8")).hexdigest()[:16]
+
+def build_prompt_parts(template: str, jd_data: dict, cv_data: dict, match_data: dict) -> tuple[str, str]:
+    """
+    Fill an agent template and split it into (prefix, suffix).
+    Every prefix starts with the same JD block (prompts/jd_header.txt), byte-identical across
+    agents and CVs, so back-to-back advice/rewrite calls for one applicant and calls for later
+    applicants share it and the inference server reuses its KV cache for it. The agent's static
+    instructions follow, then the suffix holds the CV/match blocks.
+    Templates must not contain {{JD_JSON}} and must place {{MATCH_JSON}} after {{CV_JSON}}.
+    """
+    cut = template.index("{{CV_JSON}}")
+    cut = template.rfind("\n", 0, cut) + 1  # keep the "cv = " label in the suffix
+    if "{{JD_JSON}}" in template or "{{MATCH_JSON}}" in template[:cut]:
+        raise ValueError("Template must leave the JD to the shared header and put the CV/match blocks last")
+
+    with open(JD_HEADER_PATH, "r", encoding="utf-8") as f:
+        header = f.read()
+
+    jd_json = json.dumps(jd_data, ensure_ascii=False, indent=2, sort_keys=True)
+    prefix = header.replace("{{JD_JSON}}", jd_json) + template[:cut]
+    suffix = template[cut:]
+    suffix = suffix.replace("{{CV_JSON}}", json.dumps(cv_data, ensure_ascii=False, indent=2))
+    suffix = suffix.replace("{{MATCH_JSON}}", json.dumps(match_data, ensure_ascii=False, indent=2))
+    return prefix, suffix
+
 def extract_skills_from_text(cv_text: str) -> list[str]:
     """
     Lightweight skill extractor from raw CV text to catch tokens the LLM might miss (e.g., C++).